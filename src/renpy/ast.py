@@ -65,12 +65,10 @@ class ParameterInfo(object):
 
 class ArgumentInfo(object):
     def get_code(self, **kwargs):
-        args = []
-        for key, val in self.arguments:
-            if key is not None:
-                args.append(f"{key}={val}")
-            else:
-                args.append(val)
+        args = [
+            f"{key}={val}" if key is not None else val
+            for key, val in self.arguments
+        ]
         if getattr(self, "starred_indexes", None):
             raise NotImplementedError
         if getattr(self, "doublestarred_indexes", None):
@@ -148,9 +146,7 @@ class Init(Node):
         inner_code = util.get_code(self.block, **kwargs)
         if inner_code.count("\n") == 0:
             return f"{start} {inner_code}"
-        rv = [start + ":"]
-        rv.append(util.indent(inner_code))
-        return "\n".join(rv)
+        return f"{start}:\n{util.indent(inner_code)}"
 
 
 class Label(Node):
@@ -168,9 +164,7 @@ class Label(Node):
         if self.parameters:
             start += f"{util.get_code(self.parameters,**kwargs)}"
         start += ":"  # label always has colon
-        rv = [start]
-        rv.append(util.indent(f"{util.get_code(self.block, **kwargs)}"))
-        return "\n".join(rv)
+        return f"{start}\n{util.indent(util.get_code(self.block, **kwargs))}"
 
 
 class Python(Node):
@@ -191,12 +185,9 @@ class Python(Node):
             start += f" in {storename}"
         if self.hide:
             start += " hide"
-        if self.code:
-            start += ":"
-        rv = [start]
-        if self.code:
-            rv.append(util.indent(f"{inner_code}"))
-        return "\n".join(rv)
+        if not self.code:
+            return start
+        return f"{start}:\n{util.indent(inner_code)}"
 
 
 class EarlyPython(Node):
@@ -217,12 +208,9 @@ class EarlyPython(Node):
             start += f" in {storename}"
         if self.hide:
             start += " hide"
-        if self.code:
-            start += ":"
-        rv = [start]
-        if self.code:
-            rv.append(util.indent(f"{inner_code}"))
-        return "\n".join(rv)
+        if not self.code:
+            return start
+        return f"{start}:\n{util.indent(inner_code)}"
 
 
 class Image(Node):
@@ -246,12 +234,9 @@ class Image(Node):
             raise NotImplementedError
         if self.code:
             return f"{start} = {util.get_code(self.code,**kwargs)}"
-        if self.atl:
-            start += ":"
-        rv = [start]
-        if self.atl:
-            rv.append(util.indent(f"{util.get_code(self.atl, **kwargs)}"))
-        return "\n".join(rv)
+        if not self.atl:
+            return start
+        return f"{start}:\n{util.indent(util.get_code(self.atl, **kwargs))}"
 
 
 class Transform(Node):
@@ -268,12 +253,9 @@ class Transform(Node):
             start += f" {self.varname}"
             if self.parameters:
                 start += f"{util.get_code(self.parameters,**kwargs)}"
-        if self.atl:
-            start += ":"
-        rv = [start]
-        if self.atl:
-            rv.append(util.indent(util.get_code(self.atl, **kwargs)))
-        return "\n".join(rv)
+        if not self.atl:
+            return start
+        return f"{start}:\n{util.indent(util.get_code(self.atl, **kwargs))}"
 
 
 class Show(Node):
@@ -283,12 +265,9 @@ class Show(Node):
         name = get_imspec_name(self.imspec)
         if name:
             start += f" {name}"
-        if self.atl:
-            start += ":"
-        rv = [start]
-        if self.atl:
-            rv.append(util.indent(util.get_code(self.atl, **kwargs)))
-        return "\n".join(rv)
+        if not self.atl:
+            return start
+        return f"{start}:\n{util.indent(util.get_code(self.atl, **kwargs))}"
 
 
 class ShowLayer(Node):
@@ -299,16 +278,16 @@ class ShowLayer(Node):
 
     def get_code(self, **kwargs) -> str:
         start = "show layer"
-        if hasattr(self, "layer") and self.layer:
-            start += f" {self.layer}"
-        if hasattr(self, "at_list") and self.at_list:
-            start += f" at {util.get_code(self.at_list,**kwargs)}"
-        if hasattr(self, "atl") and self.atl:
-            start += ":"
-        rv = [start]
-        if hasattr(self, "atl") and self.atl:
-            rv.append(util.indent(util.get_code(self.atl)))
-        return "\n".join(rv)
+        layer = getattr(self, "layer", None)
+        if layer:
+            start += f" {layer}"
+        at_list = getattr(self, "at_list", None)
+        if at_list:
+            start += f" at {util.get_code(at_list,**kwargs)}"
+        atl = getattr(self, "atl", None)
+        if not atl:
+            return start
+        return f"{start}:\n{util.indent(util.get_code(atl))}"
 
 
 class Scene(Node):
@@ -321,12 +300,9 @@ class Scene(Node):
                 start += f" {name}"
         if self.layer:
             start += f" {self.layer}"
-        if self.atl:
-            start += ":"
-        rv = [start]
-        if self.atl:
-            rv.append(util.indent(util.get_code(self.atl, **kwargs)))
-        return "\n".join(rv)
+        if not self.atl:
+            return start
+        return f"{start}:\n{util.indent(util.get_code(self.atl, **kwargs))}"
 
 
 class Hide(Node):
@@ -477,12 +453,9 @@ class While(Node):
 
     def get_code(self, **kwargs) -> str:
         start = f"while {self.condition}"
-        if self.block:
-            start += ":"
-        rv = [start]
-        if self.block:
-            rv.append(util.indent(util.get_code(self.block, **kwargs)))
-        return "\n".join(rv)
+        if not self.block:
+            return start
+        return f"{start}:\n{util.indent(util.get_code(self.block, **kwargs))}"
 
 
 class If(Node):
@@ -514,11 +487,9 @@ class UserStatement(Node):
         return self
 
     def get_code(self, **kwargs) -> str:
-        start = self.line
-        rv = [start]
-        if self.block:
-            rv.append(util.indent(util.get_block_code(self.block, **kwargs)))
-        return "\n".join(rv)
+        if not self.block:
+            return self.line
+        return f"{self.line}\n{util.indent(util.get_block_code(self.block, **kwargs))}"
 
 
 class PostUserStatement(Node):
@@ -609,11 +580,13 @@ class TranslateString(Node):
     """
 
     def get_code(self, **kwargs) -> str:
-        rv = []
-        rv.append(f"translate {self.language} strings:")
-        rv.append(util.indent(f"old {translation.encode_say_string(self.old)}"))
-        rv.append(util.indent(f"new {translation.encode_say_string(self.new)}"))
-        return "\n".join(rv)
+        old = translation.encode_say_string(self.old)
+        new = translation.encode_say_string(self.new)
+        return (
+            f"translate {self.language} strings:\n"
+            f"{util.indent(f'old {old}')}\n"
+            f"{util.indent(f'new {new}')}"
+        )
 
 
 class TranslatePython(Node):
@@ -669,12 +642,10 @@ class Style(Node):
             properties["take"] = self.take
         if self.delattr:
             raise NotImplementedError
-        if properties:
-            start += ":"
-        rv = [start]
-        if properties:
-            rv.append(util.indent(util.get_code_properties(properties, newline=True)))
-        return "\n".join(rv)
+        if not properties:
+            return start
+        properties_code = util.get_code_properties(properties, newline=True)
+        return f"{start}:\n{util.indent(properties_code)}"
 
 
 class Testcase(Node):
@@ -699,9 +670,6 @@ class Camera(Node):
             start += f" {self.layer}"
         if self.at_list:
             start += f" at {util.get_code(self.at_list,**kwargs)}"
-        if self.atl:
-            start += ":"
-        rv = [start]
-        if self.atl:
-            rv.append(util.indent(util.get_code(self.atl, **kwargs)))
-        return "\n".join(rv)
+        if not self.atl:
+            return start
+        return f"{start}:\n{util.indent(util.get_code(self.atl, **kwargs))}"
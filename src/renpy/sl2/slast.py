@@ -6,17 +6,25 @@ class SLContext(ui.Addable):
 
 
 class SLNode(object):
-    pass
+    # fixed code of statements without any arguments, like transclude
+    _CODE = None
+
+    def get_code(self, **kwargs) -> str:
+        if self._CODE is not None:
+            return self._CODE
+        sink = util.Sink()
+        self.write_code(sink, **kwargs)
+        return sink.getvalue()
 
 
 class SLBlock(SLNode):
-    def get_code(self, **kwargs) -> str:
-        rv = []
+    def write_code(self, sink: util.Sink, **kwargs) -> None:
         if self.keyword:
-            rv.append(util.get_code_properties(self.keyword, newline=True))
+            sink.write(util.get_code_properties(self.keyword, newline=True))
         if self.children:
-            rv.append(util.get_code(self.children, **kwargs))
-        return "\n".join(rv)
+            if self.keyword:
+                sink.write("\n")
+            util.write_code(self.children, sink, **kwargs)
 
 
 class SLCache(object):
@@ -67,6 +75,9 @@ class SLDisplayable(SLBlock):
     """
 
     def get_name(self) -> str:
+        cached = self.__dict__.get("_cached_name")
+        if cached is not None:
+            return cached
         # higher version use style instead of name
         name = getattr(self, "name", None)
         displable = getattr(self, "displayable", None)
@@ -90,9 +101,10 @@ class SLDisplayable(SLBlock):
                     start = self.style
                 case "window":
                     start = self.style
+        self.__dict__["_cached_name"] = start
         return start
 
-    def get_code(self, **kwargs) -> str:
+    def write_code(self, sink: util.Sink, **kwargs) -> None:
         # higher version use style instead of name
         start = self.get_name()
         if not start:
@@ -122,33 +134,35 @@ class SLDisplayable(SLBlock):
         if not self.children:
             if self.keyword:
                 start += f" {util.get_code_properties(self.keyword)}"
-            return start
+            sink.write(start)
+            return
         # children
-        start += ":"
-        rv = [start]
+        sink.write(start + ":")
         if self.keyword:
-            rv.append(util.indent(util.get_code_properties(self.keyword, newline=True)))
-        rv.append(util.indent(util.get_code(self.children, **kwargs)))
-        return "\n".join(rv)
+            sink.write("\n")
+            with sink.indented():
+                sink.write(util.get_code_properties(self.keyword, newline=True))
+        sink.write("\n")
+        with sink.indented():
+            util.write_code(self.children, sink, **kwargs)
 
 
 class SLIf(SLNode):
-    def get_code(self, **kwargs) -> str:
-        rv = []
+    def write_code(self, sink: util.Sink, **kwargs) -> None:
         for index, (cond, body) in enumerate(self.entries):
-            body_code = util.get_code(body, **kwargs)
-            if not body_code:
-                body_code = "pass"
-            body_code = util.indent(body_code)
             if index == 0:
-                rv.append(f"if {cond}:\n{body_code}")
-                continue
-            if cond and cond != "True":
-                rv.append(f"elif {cond}:\n{body_code}")
+                sink.write(f"if {cond}:\n")
+            elif cond and cond != "True":
+                sink.write(f"\nelif {cond}:\n")
             else:
-                rv.append(f"else:\n{body_code}")
+                sink.write("\nelse:\n")
+            with sink.indented():
+                written = sink.written
+                util.write_code(body, sink, **kwargs)
+                if sink.written == written:
+                    sink.write("pass")
+            if index and not (cond and cond != "True"):
                 break
-        return "\n".join(rv)
 
 
 class SLShowIf(SLNode):
@@ -165,22 +179,21 @@ class SLShowIf(SLNode):
         text "Liftoff!" size 100 at cd_transform
     """
 
-    def get_code(self, **kwargs) -> str:
-        rv = []
+    def write_code(self, sink: util.Sink, **kwargs) -> None:
         for index, (cond, body) in enumerate(self.entries):
-            body_code = util.get_code(body, **kwargs)
-            if not body_code:
-                body_code = "pass"
-            body_code = util.indent(body_code)
             if index == 0:
-                rv.append(f"showif {cond}:\n{body_code}")
-                continue
-            if cond and cond != "True":
-                rv.append(f"elif {cond}:\n{body_code}")
+                sink.write(f"showif {cond}:\n")
+            elif cond and cond != "True":
+                sink.write(f"\nelif {cond}:\n")
             else:
-                rv.append(f"else:\n{body_code}")
+                sink.write("\nelse:\n")
+            with sink.indented():
+                written = sink.written
+                util.write_code(body, sink, **kwargs)
+                if sink.written == written:
+                    sink.write("pass")
+            if index and not (cond and cond != "True"):
                 break
-        return "\n".join(rv)
 
 
 class SLFor(SLBlock):
@@ -193,23 +206,29 @@ class SLFor(SLBlock):
                 textbutton numeral action Return(i + 1)
     """
 
-    def get_code(self, **kwargs) -> str:
-        start = f"for {self.variable} in {self.expression}:"
-        rv = [start]
-        rv.append(util.indent(util.get_code(self.children, **kwargs)))
-        return "\n".join(rv)
+    def write_code(self, sink: util.Sink, **kwargs) -> None:
+        sink.write(f"for {self.variable} in {self.expression}:\n")
+        with sink.indented():
+            util.write_code(self.children, sink, **kwargs)
 
 
 class SLPython(SLNode):
-    def get_code(self, **kwargs) -> str:
+    def write_code(self, sink: util.Sink, **kwargs) -> None:
         inner_code = util.get_code(self.code, **kwargs)
         if len(inner_code.splitlines()) == 1:
-            return f"$ {inner_code}"
-        return f"python:\n{util.indent(inner_code)}"
+            sink.write(f"$ {inner_code}")
+            return
+        sink.write("python:\n")
+        with sink.indented():
+            sink.write(inner_code)
 
 
 class SLPass(SLNode):
-    pass
+    _CODE = "pass"
+
+
+class SLContinue(SLNode):
+    _CODE = "continue"
 
 
 # https://www.renpy.org/doc/html/python.html#default-statement
@@ -219,7 +238,7 @@ class SLDefault(SLNode):
 
 
 class SLUse(SLNode):
-    def get_code(self, **kwargs) -> str:
+    def write_code(self, sink: util.Sink, **kwargs) -> None:
         start = f"use"
         if self.target:
             if isinstance(self.target, ast.PyExpr):
@@ -230,12 +249,15 @@ class SLUse(SLNode):
             start += f"{util.get_code(self.args, **kwargs)}"
         if self.block or self.ast:
             start += ":"
-        rv = [start]
+        sink.write(start)
         if self.block:
-            rv.append(util.indent(util.get_code(self.block, **kwargs)))
+            sink.write("\n")
+            with sink.indented():
+                util.write_code(self.block, sink, **kwargs)
         if self.ast:
-            rv.append(util.indent(util.get_code(self.ast, **kwargs)))
-        return "\n".join(rv)
+            sink.write("\n")
+            with sink.indented():
+                util.write_code(self.ast, sink, **kwargs)
 
 
 # https://www.renpy.org/doc/html/screens.html#use-and-transclude
@@ -253,8 +275,7 @@ screen movable_frame(pos):
 
 
 class SLTransclude(SLNode):
-    def get_code(self, **kwargs) -> str:
-        return "transclude"
+    _CODE = "transclude"
 
 
 # https://www.renpy.org/doc/html/screens.html#screen-statement
@@ -262,29 +283,34 @@ class SLScreen(SLBlock):
     parameters: ast.ParameterInfo
     keyword: list
 
-    def get_code(self, **kwargs) -> str:
+    def write_code(self, sink: util.Sink, **kwargs) -> None:
         start = "screen"
         if self.name:
             start += f" {self.name}"
             if self.parameters:
                 start += f"{util.get_code(self.parameters, **kwargs)}"
 
-        properties = self.keyword.copy()
+        extra = []
         if self.tag:
-            properties.append(("tag", self.tag))
+            extra.append(("tag", self.tag))
         if self.layer != "'screens'" and self.layer != "None":
-            properties.append(("layer", self.layer))
+            extra.append(("layer", self.layer))
+        # only read by get_code_properties, so the keyword list can be shared
+        properties = self.keyword + extra if extra else self.keyword
 
         if properties or self.children:
             start += ":"
 
-        rv = [start]
+        sink.write(start)
         # keyword
         if properties:
-            rv.append(util.indent(util.get_code_properties(properties, newline=True)))
+            sink.write("\n")
+            with sink.indented():
+                sink.write(util.get_code_properties(properties, newline=True))
         # children
-        rv.append(util.indent(util.get_code(self.children, **kwargs)))
-        return "\n".join(rv)
+        sink.write("\n")
+        with sink.indented():
+            util.write_code(self.children, sink, **kwargs)
 
 
 class ScreenCache(object):
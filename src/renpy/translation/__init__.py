@@ -1,5 +1,7 @@
 import re
 
+_DOUBLE_SPACE = re.compile(r"(?<= ) ")
+
 
 class ScriptTranslator(object):
     pass
@@ -21,7 +23,8 @@ def encode_say_string(s):
     s = s.replace("\\", "\\\\")
     s = s.replace("\n", "\\n")
     s = s.replace('"', '\\"')
-    s = re.sub(r"(?<= ) ", "\\ ", s)
+    if "  " in s:
+        s = _DOUBLE_SPACE.sub("\\ ", s)
 
     return '"' + s + '"'
 
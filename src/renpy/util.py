@@ -1,17 +1,75 @@
+import io
+from contextlib import contextmanager
+
 from . import ast
 
 IDENT_CHAR = "    "
 
+# characters str.splitlines() treats as line boundaries
+_LINE_BREAKS = frozenset("\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029")
+
 
 def indent(code: str, level: int = 1) -> str:
+    prefix = IDENT_CHAR * level
     return "".join(
-        map(
-            lambda x: f"{IDENT_CHAR * level}{x}",
-            filter(lambda x: x.strip(), code.splitlines(keepends=True)),
-        )
+        [prefix + line for line in code.splitlines(keepends=True) if line.strip()]
     )
 
 
+class Sink(object):
+    """
+    Accumulates generated code in a single buffer.
+
+    Code written inside `indented()` is indented the same way `indent` does,
+    so nested nodes can write into the buffer directly instead of returning
+    strings that every parent re-indents and joins again.
+
+    >>> sink = Sink()
+    >>> sink.write("screen main:\\n")
+    >>> with sink.indented():
+    ...     sink.write("vbox")
+    >>> sink.getvalue()
+    'screen main:\\n    vbox'
+    """
+
+    def __init__(self) -> None:
+        self._buf = io.StringIO()
+        self._level = 0
+        self._bol = True  # at the beginning of a line
+        # characters passed to write(), including blank lines dropped by indent
+        self.written = 0
+
+    @contextmanager
+    def indented(self, level: int = 1):
+        self._level += level
+        try:
+            yield self
+        finally:
+            self._level -= level
+
+    def write(self, code: str) -> None:
+        if not code:
+            return
+        self.written += len(code)
+        buf = self._buf
+        level = self._level
+        if not level:
+            buf.write(code)
+            self._bol = code[-1] in _LINE_BREAKS
+            return
+        prefix = IDENT_CHAR * level
+        for line in code.splitlines(keepends=True):
+            if self._bol:
+                if not line.strip():
+                    continue
+                buf.write(prefix)
+            buf.write(line)
+            self._bol = line[-1] in _LINE_BREAKS
+
+    def getvalue(self) -> str:
+        return self._buf.getvalue()
+
+
 def get_code_properties(props: tuple | dict, newline: bool = False) -> str:
     """
     :param keyword: tuple | dict
@@ -63,39 +121,42 @@ def get_code(node, **kwargs) -> str:
         if node type is not implemented or some attributes unable to handle.
 
     """
-    if isinstance(node, list):
+    # exact type check: statement blocks are always plain lists
+    if type(node) is list:
+        Say, Label, Menu, With, Call, Pass = (
+            ast.Say,
+            ast.Label,
+            ast.Menu,
+            ast.With,
+            ast.Call,
+            ast.Pass,
+        )
         rv = []
-        skip_next = 0
-        for idx, item in enumerate(node):
-            if skip_next > 0:
-                skip_next -= 1
-                continue
-
-            prev = node[idx - 1] if idx > 0 else None
-            next = node[idx + 1] if idx < len(node) - 1 else None
+        i, n = -1, len(node)
+        while i + 1 < n:
+            i += 1
+            item = node[i]
+            prev = node[i - 1] if i > 0 else None
+            next = node[i + 1] if i + 1 < n else None
 
             # TODO: it's a hack, fix it later
-            if (
-                isinstance(item, ast.Say)
-                and not item.interact
-                and isinstance(next, ast.Menu)
-            ):
+            if isinstance(item, Say) and not item.interact and isinstance(next, Menu):
                 continue
-            if isinstance(item, ast.Label) and isinstance(next, ast.Menu):
+            if isinstance(item, Label) and isinstance(next, Menu):
                 if next.statement_start == item:
                     continue  # skip label before menu
-            if isinstance(item, ast.With):
+            if isinstance(item, With):
                 if item.paired:
                     continue
-                prevprev = node[idx - 2] if idx - 2 >= 0 else None
-                if isinstance(prevprev, ast.With) and prevprev.paired == item.expr:
+                prevprev = node[i - 2] if i > 1 else None
+                if isinstance(prevprev, With) and prevprev.paired == item.expr:
                     rv[-1] = __append_first_line(rv[-1], f" with {item.expr}")
                     continue
-            if isinstance(item, ast.Label) and isinstance(prev, ast.Call):
+            if isinstance(item, Label) and isinstance(prev, Call):
                 rv[-1] = __append_first_line(rv[-1], f" from {item.name}")
-                if isinstance(next, ast.Pass):
+                if isinstance(next, Pass):
                     # skip pass after call
-                    skip_next += 1
+                    i += 1
                 continue
             rv.append(get_code(item, **kwargs))
         return "\n".join(rv)
@@ -107,17 +168,58 @@ def get_code(node, **kwargs) -> str:
     return node.get_code(**kwargs)
 
 
+def write_code(node, sink: Sink, **kwargs) -> None:
+    """
+    Same as `get_code`, but writes the generated code into `sink`.
+
+    Nodes providing `write_code(sink, **kwargs)` write into the sink
+    directly, others fall back to their `get_code`.
+    """
+    if type(node) is list:
+        # lists written this way hold screen language nodes only, which need
+        # none of the statement fix-ups done by get_code
+        for idx, item in enumerate(node):
+            if idx:
+                sink.write("\n")
+            write_code(item, sink, **kwargs)
+        return
+
+    # modify node before get code
+    modifier = kwargs.get("modifier")
+    if modifier:
+        modifier(node, **kwargs)
+    writer = getattr(node, "write_code", None)
+    if writer is not None:
+        writer(sink, **kwargs)
+        return
+    # statements with fixed code skip the get_code call
+    code = getattr(node, "_CODE", None)
+    if code is None:
+        code = node.get_code(**kwargs)
+    sink.write(code)
+
+
 def get_block_code(node, **kwargs) -> str:
     """
     https://www.renpy.org/doc/html/layeredimage.html#layeredimage
     """
+    sink = Sink()
+    write_block_code(node, sink, **kwargs)
+    return sink.getvalue()
+
+
+def write_block_code(node, sink: Sink, **kwargs) -> None:
     if isinstance(node, list):
-        return "\n".join(map(lambda x: get_block_code(x, **kwargs), node))
-    lines = []
+        for idx, item in enumerate(node):
+            if idx:
+                sink.write("\n")
+            write_block_code(item, sink, **kwargs)
+        return
     if isinstance(node, tuple) and len(node) >= 4:
         _, _, code, block = node
-        lines.append(code)
-        lines.append(indent(get_block_code(block, **kwargs)))
+        sink.write(code)
+        sink.write("\n")
+        with sink.indented():
+            write_block_code(block, sink, **kwargs)
     else:
         raise NotImplementedError
-    return "\n".join(lines)
@@ -1,5 +1,6 @@
 import argparse
 import logging
+import sys
 from rpycdec.decompile import decompile
 from rpycdec.rpa import extract_rpa
 
@@ -24,6 +25,34 @@ def extract_rpa_files(srcs: list[str]):
             extract_rpa(f)
 
 
+def _build_decompile(subparsers):
+    decompile_parser = subparsers.add_parser("decompile", help="decompile rpyc file")
+    decompile_parser.add_argument("src", nargs=1, help="rpyc file or directory")
+    decompile_parser.set_defaults(func=decompile_files)
+
+
+def _build_unrpa(subparsers):
+    unrpa_parser = subparsers.add_parser("unrpa", help="extract rpa archive")
+    unrpa_parser.add_argument("src", nargs=1, help="rpa archive")
+    unrpa_parser.set_defaults(func=extract_rpa_files)
+
+
+_SUBCOMMANDS = {
+    "decompile": _build_decompile,
+    "unrpa": _build_unrpa,
+}
+
+
+def _sniff_subcommand(argv: list[str]) -> str | None:
+    """
+    return the subcommand named in argv, or None if there is none.
+    """
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg if arg in _SUBCOMMANDS else None
+    return None
+
+
 def main():
     """
     command line tool entry.
@@ -38,13 +67,14 @@ def main():
         title="subcommands", dest="command", help="subcommand help"
     )
 
-    decompile_parser = subparsers.add_parser("decompile", help="decompile rpyc file")
-    decompile_parser.add_argument("src", nargs=1, help="rpyc file or directory")
-    decompile_parser.set_defaults(func=decompile_files)
-
-    unrpa_parser = subparsers.add_parser("unrpa", help="extract rpa archive")
-    unrpa_parser.add_argument("src", nargs=1, help="rpa archive")
-    unrpa_parser.set_defaults(func=extract_rpa_files)
+    # only build the parser of the subcommand being run, all of them otherwise
+    # so that help and usage errors list every subcommand
+    command = _sniff_subcommand(sys.argv[1:])
+    if command:
+        _SUBCOMMANDS[command](subparsers)
+    else:
+        for build in _SUBCOMMANDS.values():
+            build(subparsers)
 
     args = argparser.parse_args()
     if args.verbose:
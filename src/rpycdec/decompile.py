@@ -1,5 +1,9 @@
+import functools
+import importlib.metadata
+import json
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from rpycdec import utils, stmts
 import renpy.ast
 import renpy.sl2.slast
@@ -8,13 +12,65 @@ import renpy.util
 logger = logging.getLogger(__name__)
 
 
-def decompile_file(input_file, output_file=None):
+@functools.cache
+def _package_version() -> str | None:
+    try:
+        return importlib.metadata.version("rpycdec")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def _file_key(filename) -> dict | None:
+    """
+    identify a file by path, modification time and size, None if missing.
+    """
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return {
+        "path": os.path.abspath(filename),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+    }
+
+
+def _cache_key(input_file, output_file) -> dict:
+    """
+    identify a decompile run by the rpycdec version, the input and the output
+    it wrote, so a changed input, a rewritten output or an upgrade all miss.
+    """
+    return {
+        "version": _package_version(),
+        "input": _file_key(input_file),
+        "output": _file_key(output_file),
+    }
+
+
+def _read_cache(cache_file) -> dict | None:
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def decompile_file(input_file, output_file=None, incremental=False):
     """
     decompile rpyc file into rpy file and write to output.
+
+    With `incremental`, a `<output>.cache.json` file records the run and the
+    file is skipped while the input, the output and rpycdec are unchanged.
     """
     if not output_file:
         name, _ = os.path.splitext(input_file)
         output_file = f"{name}.rpy"
+    cache_file = f"{output_file}.cache.json"
+    if incremental:
+        key = _cache_key(input_file, output_file)
+        if key["output"] and _read_cache(cache_file) == key:
+            logger.info(f"skip unchanged {input_file}")
+            return
     stmt = stmts.load_file(input_file)
     try:
         code = renpy.util.get_code(stmt)
@@ -22,10 +78,12 @@ def decompile_file(input_file, output_file=None):
         logger.error(f"decode file {input_file} failed: {e}")
         raise e
     utils.write_file(output_file, code)
+    if incremental:
+        utils.write_file(cache_file, json.dumps(_cache_key(input_file, output_file)))
     logger.info(f"decompile {input_file} -> {output_file}")
 
 
-def decompile(input_path, output_path=None):
+def decompile(input_path, output_path=None, incremental=False):
     """
     decompile rpyc file or directory into rpy
 
@@ -35,14 +93,43 @@ def decompile(input_path, output_path=None):
         path to rpyc file or directory contains rpyc files
     output_path : str, optional
         output path, by default it's same path of input_path.
+    incremental : bool, optional
+        skip files decompiled before and unchanged since, see decompile_file.
     """
     if not os.path.isdir(input_path):
-        decompile_file(input_path, output_path)
+        decompile_file(input_path, output_path, incremental)
         return
     if not output_path:
         output_path = input_path
-    for filename in utils.match_files(input_path, r".*\.rpym?c$"):
-        decompile_file(
+    files = utils.match_files(input_path, utils.RPYC_SUFFIXES)
+    jobs = [
+        (
             os.path.join(input_path, filename),
             os.path.join(output_path, filename.removesuffix("c")),
         )
+        for filename in files
+    ]
+    if len(jobs) <= 1:
+        for input_file, output_file in jobs:
+            decompile_file(input_file, output_file, incremental)
+        return
+    failed = {}
+    # files are independent, decompile them in parallel processes
+    with ProcessPoolExecutor() as executor:
+        futures = {
+            executor.submit(decompile_file, input_file, output_file, incremental): (
+                input_file
+            )
+            for input_file, output_file in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failed[futures[future]] = e
+    if failed:
+        errors = sorted(failed.items())
+        details = "; ".join(f"{name}: {e}" for name, e in errors)
+        raise Exception(
+            f"decompile {len(failed)} of {len(jobs)} files failed: {details}"
+        ) from errors[0][1]
@@ -1,17 +1,30 @@
+import mmap
 import os
 import pickle
-import zlib
-from io import BufferedIOBase
+from concurrent.futures import ThreadPoolExecutor
+from io import SEEK_CUR, BufferedIOBase
+
+from rpycdec import utils
+
+# size of the buffer entries are copied through when the archive can't be mapped
+COPY_BUFFER_SIZE = 1 << 20
 
 
 def read_util(data: BufferedIOBase, util: int = 0x00) -> bytes:
-    content = bytearray()
+    """
+    read until the `util` byte, leaving the stream just after it.
+    """
+    content = b""
     while True:
-        c = data.read(1)
-        if c[0] == util:
-            break
-        content += c
-    return content
+        chunk = data.read(64)
+        if not chunk:
+            raise EOFError(f"byte {util:#04x} not found")
+        idx = chunk.find(util)
+        if idx >= 0:
+            # rewind to just after the delimiter
+            data.seek(idx + 1 - len(chunk), SEEK_CUR)
+            return content + chunk[:idx]
+        content += chunk
 
 
 def to_start(start: str | None | bytes) -> bytes:
@@ -22,6 +35,16 @@ def to_start(start: str | None | bytes) -> bytes:
     return start.encode("latin-1")
 
 
+def _decode_entries(entries: list, key: int):
+    """
+    yield (offset, length, start, len(start)) of each segment of an index
+    entry, decoded with the archive key as they are extracted.
+    """
+    for offset, dlen, *left in entries:
+        start = to_start(left[0]) if left else b""
+        yield offset ^ key, dlen ^ key, start, len(start)
+
+
 def extract_rpa(r: BufferedIOBase, dir: str | None = None):
     magic = read_util(r, 0x20)
     if magic != b"RPA-3.0":
@@ -32,29 +55,69 @@ def extract_rpa(r: BufferedIOBase, dir: str | None = None):
 
     # read index
     r.seek(index_offset)
-    index = pickle.loads(zlib.decompress(r.read()))
-    for k, v in index.items():
-        index[k] = [
-            (offset ^ key, dlen ^ key, b"" if len(left) == 0 else to_start(left[0]))
-            for offset, dlen, *left in v
-        ]
+    # unpickle from the buffer itself, reading through the stream
+    # interface is much slower
+    index = pickle.loads(utils.decompress_stream(r))
 
     if not dir:
         dir = os.path.splitext(r.name)[0]
-    for filename, entries in index.items():
-        data = bytearray()
-        for offset, dlen, start in entries:
-            r.seek(offset)
-            block = r.read(dlen)
-            if start:
-                if block.startswith(start):
-                    block = block[len(start) :]
-                else:
-                    print("Warning: %s does not start with %s" % (filename, start))
-            data += block
+    # create all output directories up front, extraction only writes files
+    for parent in sorted({os.path.dirname(os.path.join(dir, fn)) for fn in index}):
+        os.makedirs(parent, exist_ok=True)
+    try:
+        fileno = r.fileno()
+    except OSError:
+        fileno = None
+    if fileno is None:
+        _stream_files(r, dir, index, key)
+        return
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as buf:
+            _extract_files(buf, dir, index, key)
+
 
+def _extract_files(buf: memoryview, dir: str, index: dict, key: int):
+    def extract(item):
+        filename, entries = item
+        filename = os.path.join(dir, filename)
+        with open(filename, "wb") as f:
+            print("extracting: ", filename)
+            for offset, dlen, start, slen in _decode_entries(entries, key):
+                end = offset + dlen
+                if slen:
+                    if buf[offset : min(offset + slen, end)] == start:
+                        offset += slen
+                    else:
+                        print("Warning: %s does not start with %s" % (filename, start))
+                f.write(buf[offset:end])
+
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(extract, index.items()))
+
+
+def _stream_files(r: BufferedIOBase, dir: str, index: dict, key: int):
+    """
+    copy entries of an archive without a file descriptor segment by
+    segment through one reused buffer.
+    """
+    buf = bytearray(COPY_BUFFER_SIZE)
+    view = memoryview(buf)
+    for filename, entries in index.items():
         filename = os.path.join(dir, filename)
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
         with open(filename, "wb") as f:
             print("extracting: ", filename)
-            f.write(data)
+            for offset, dlen, start, slen in _decode_entries(entries, key):
+                r.seek(offset)
+                if slen:
+                    head = r.read(min(slen, dlen))
+                    dlen -= len(head)
+                    if head != start:
+                        print("Warning: %s does not start with %s" % (filename, start))
+                        f.write(head)
+                while dlen > 0:
+                    n = r.readinto(view[: min(dlen, COPY_BUFFER_SIZE)])
+                    if not n:
+                        break
+                    f.write(view[:n])
+                    dlen -= n
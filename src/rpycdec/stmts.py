@@ -3,14 +3,16 @@ import logging
 from os import path
 import pickle
 import struct
-import zlib
 
 from renpy.ast import Node
+from rpycdec import utils
 
 logger = logging.getLogger(__name__)
 
 # A string at the start of each rpycv2 file.
 RPYC2_HEADER = b"RENPY RPC2"
+# A (slot, start, length) entry of the slot table following the header.
+RPYC2_SLOT = struct.Struct("<III")
 
 
 class DummyClass(object):
@@ -48,7 +50,7 @@ class DummyClass(object):
 
 class GenericUnpickler(pickle.Unpickler):
     def find_class(self, module, name):
-        if module.startswith("store") or module.startswith("renpy"):
+        if module.startswith(("store", "renpy")):
             return type(name, (DummyClass,), {"__module__": module})
         return super().find_class(module, name)
 
@@ -58,26 +60,24 @@ def read_rpyc_data(file: io.BufferedReader, slot):
     Reads the binary data from `slot` in a .rpyc (v1 or v2) file. Returns
     the data if the slot exists, or None if the slot does not exist.
     """
-    header_data = file.read(1024)
-    # Legacy path.
-    if header_data[: len(RPYC2_HEADER)] != RPYC2_HEADER:
+    # Legacy path, the whole file is compressed data.
+    if file.read(len(RPYC2_HEADER)) != RPYC2_HEADER:
         if slot != 1:
             return None
         file.seek(0)
-        data = file.read()
-        return zlib.decompress(data)
-    # RPYC2 path.
-    pos = len(RPYC2_HEADER)
-    while True:
-        header_slot, start, length = struct.unpack("III", header_data[pos : pos + 12])
+        return utils.decompress_stream(file)
+    # RPYC2 path, the slot table fills the rest of the 1024 byte header.
+    header_data = memoryview(file.read(1024 - len(RPYC2_HEADER)))
+    end = len(header_data) // RPYC2_SLOT.size * RPYC2_SLOT.size
+    for header_slot, start, length in RPYC2_SLOT.iter_unpack(header_data[:end]):
         if slot == header_slot:
             break
         if header_slot == 0:
             return None
-        pos += 12
+    else:
+        return None
     file.seek(start)
-    data = file.read(length)
-    return zlib.decompress(data)
+    return utils.decompress_stream(file, length)
 
 
 def load(data: io.BufferedReader) -> Node | None:
@@ -3,8 +3,9 @@ import os
 import re
 import sqlite3
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from hashlib import sha256
+from itertools import repeat
 from typing import Callable
 import requests
 from ratelimit import limits, sleep_and_retry
@@ -319,6 +320,29 @@ def get_code_with_callback(stmts, callback) -> str:
     )
 
 
+def _collect_file(filename: str) -> list[tuple]:
+    """
+    load a file and return the meta of every translatable text in it, in order
+    """
+    metas = []
+
+    def collect(meta: tuple) -> str:
+        metas.append(meta)
+        return meta[4] or meta[3]
+
+    get_code_with_callback(stmts.load_file(filename), collect)
+    return metas
+
+
+def _generate_file(filename: str, results_dict: dict) -> str:
+    """
+    load a file and return its code with texts replaced from results_dict
+    """
+    return get_code_with_callback(
+        stmts.load_file(filename), lambda meta: _do_consume(meta, results_dict)
+    )
+
+
 def default_translator() -> Callable[[str], str]:
     """
     default translator which use google translate api with CachedTranslator
@@ -326,30 +350,12 @@ def default_translator() -> Callable[[str], str]:
     return CachedTranslator(GoogleTranslator().translate).translate
 
 
-def _process_files(
-    base_dir: str,
-    files: list[str],
-    translator: Callable[[str], str]=default_translator(),
-    include_tl_lang: str = "english",
-    concurent: int = 0,
+def _translate_texts(
+    translator: Callable[[str], str], translations_dict: dict, concurent: int = 0
 ) -> dict[str, str]:
     """
-    translate files and return a map of filename and code
+    translate collected texts and return a map of label and translated text
     """
-    stmts_dict = {}
-    translations_dict = {}
-    # load translations
-    for filename in files:
-        logger.info("loading %s", filename)
-        loaded_stmts = stmts.load_file(os.path.join(base_dir, filename))
-        stmts_dict[filename] = loaded_stmts
-        get_code_with_callback(
-            loaded_stmts,
-            lambda meta: _do_collect(meta, include_tl_lang, translations_dict),
-        )
-    logger.info("loaded %d translations", len(translations_dict))
-
-    # translate
     logger.info("translating")
     results_dict = {}
     code_translator = CodeTranslator(translator)
@@ -372,6 +378,43 @@ def _process_files(
         for label, (kind, text) in translations_dict.items():
             results_dict[label] = code_translator.translate(kind, text)
             logger.info("translated %d/%d", len(results_dict), len(translations_dict))
+    return results_dict
+
+
+def _process_files(
+    base_dir: str,
+    files: list[str],
+    translator: Callable[[str], str] | None = None,
+    include_tl_lang: str = "english",
+    concurent: int = 0,
+    workers: int = 0,
+) -> dict[str, str]:
+    """
+    translate files and return a map of filename and code
+    """
+    if translator is None:
+        translator = default_translator()
+    paths = [os.path.join(base_dir, filename) for filename in files]
+    if workers > 1 and len(files) > 1:
+        return _process_files_parallel(
+            files, paths, translator, include_tl_lang, concurent, workers
+        )
+
+    stmts_dict = {}
+    translations_dict = {}
+    # load translations
+    for filename, path in zip(files, paths):
+        logger.info("loading %s", filename)
+        loaded_stmts = stmts.load_file(path)
+        stmts_dict[filename] = loaded_stmts
+        get_code_with_callback(
+            loaded_stmts,
+            lambda meta: _do_collect(meta, include_tl_lang, translations_dict),
+        )
+    logger.info("loaded %d translations", len(translations_dict))
+
+    # translate
+    results_dict = _translate_texts(translator, translations_dict, concurent)
 
     # generate code
     code_files = {}
@@ -384,15 +427,64 @@ def _process_files(
     return code_files
 
 
+def _process_files_parallel(
+    files: list[str],
+    paths: list[str],
+    translator: Callable[[str], str],
+    include_tl_lang: str,
+    concurent: int,
+    workers: int,
+) -> dict[str, str]:
+    """
+    same as _process_files, loading and walking files in worker processes.
+
+    Workers send back only the texts they collected and the generated code,
+    never the loaded trees: pickling a tree back to this process costs about
+    as much as loading it here. Each file is therefore loaded twice, once per
+    walk, which still takes less wall time than the sequential path as soon
+    as two workers share the loads and walks.
+    """
+    # send results_dict once per chunk of files rather than once per file
+    chunksize = max(1, len(paths) // (workers * 4))
+    translations_dict = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # load translations
+        collected = executor.map(_collect_file, paths, chunksize=chunksize)
+        for filename, metas in zip(files, collected):
+            logger.info("loaded %s", filename)
+            for meta in metas:
+                _do_collect(meta, include_tl_lang, translations_dict)
+        logger.info("loaded %d translations", len(translations_dict))
+
+        # translate
+        results_dict = _translate_texts(translator, translations_dict, concurent)
+
+        # generate code
+        code_files = {}
+        logger.info("generating code")
+        codes = executor.map(
+            _generate_file, paths, repeat(results_dict), chunksize=chunksize
+        )
+        for filename, code in zip(files, codes):
+            logger.info("generated code for %s", filename)
+            code_files[filename] = code
+    return code_files
+
+
 def translate(
     input_path,
     output_path=None,
-    translator: Callable[[str], str] = default_translator(),
+    translator: Callable[[str], str] | None = None,
     include_tl_lang: str = "english",
     concurent: int = 0,
+    workers: int = 0,
 ):
     """
     translate rpyc file or directory
+
+    `concurent` is the number of texts translated at once, 0 translates one at
+    a time. `workers` is the number of processes loading the files of a
+    directory, 0 or 1 loads them one at a time in this process.
     """
     if os.path.isfile(input_path):
         if not output_path:
@@ -408,13 +500,14 @@ def translate(
 
     if not output_path:
         output_path = input_path
-    matches = utils.match_files(input_path, r".*\.rpym?c$")
+    matches = utils.match_files(input_path, utils.RPYC_SUFFIXES)
     file_codes = _process_files(
         input_path,
         matches,
         translator=translator,
         include_tl_lang=include_tl_lang,
         concurent=concurent,
+        workers=workers,
     )
     for filename, code in file_codes.items():
         output_file = os.path.join(output_path, filename.removesuffix("c"))
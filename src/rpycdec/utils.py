@@ -1,5 +1,10 @@
 import os
 import re
+import zlib
+from io import BufferedIOBase, BytesIO
+
+# size of the compressed chunks read by decompress_stream
+DECOMPRESS_CHUNK_SIZE = 1 << 20
 
 
 def write_file(filename: str, data: str):
@@ -13,7 +18,11 @@ def write_file(filename: str, data: str):
         file.write(data)
 
 
-def match_files(base_dir: str, pattern: str) -> list[str]:
+# suffixes of compiled ren'py scripts
+RPYC_SUFFIXES = (".rpyc", ".rpymc")
+
+
+def match_files(base_dir: str, pattern: str | tuple[str, ...]) -> list[str]:
     """
     match files in dir with regex pattern
 
@@ -21,8 +30,9 @@ def match_files(base_dir: str, pattern: str) -> list[str]:
     ----------
     base_dir : str
         directory to find in
-    pattern : str
-        regex pattern
+    pattern : str | tuple[str, ...]
+        regex pattern, or a tuple of filename suffixes to match with
+        str.endswith instead
 
     Returns
     -------
@@ -30,13 +40,58 @@ def match_files(base_dir: str, pattern: str) -> list[str]:
         matched filenames relative to base_dir
     """
 
-    if pattern == "":
-        pattern = ".*"
+    if isinstance(pattern, tuple):
+
+        def matches(filename: str) -> bool:
+            return filename.endswith(pattern)
+
+    else:
+        matches = re.compile(pattern or ".*").match
     results = []
-    matched = re.compile(pattern)
     for root, _, files in os.walk(base_dir):
+        # resolve the directory relative to base_dir once for all its files
+        rel = os.path.relpath(root, base_dir)
         for filename in files:
-            filename = os.path.relpath(os.path.join(root, filename), base_dir)
-            if matched.match(filename):
+            if rel != os.curdir:
+                filename = os.path.join(rel, filename)
+            if matches(filename):
                 results.append(filename)
     return results
+
+
+def decompress_stream(file: BufferedIOBase, length: int = -1) -> bytes:
+    """
+    decompress zlib data from the current position of file chunk by chunk,
+    without holding all of the compressed data in memory next to the
+    decompressed one.
+
+    Parameters
+    ----------
+    file : BufferedIOBase
+        file positioned at the start of the compressed data
+    length : int, optional
+        size of the compressed data, by default read until the stream ends
+
+    Returns
+    -------
+    bytes
+        decompressed data
+    """
+    dec = zlib.decompressobj()
+    buf = BytesIO()
+    while length:
+        size = DECOMPRESS_CHUNK_SIZE
+        if 0 < length < size:
+            size = length
+        chunk = file.read(size)
+        if not chunk:
+            break
+        if length > 0:
+            length -= len(chunk)
+        buf.write(dec.decompress(chunk))
+        if dec.eof:
+            break
+    buf.write(dec.flush())
+    if not dec.eof:
+        raise zlib.error("incomplete or truncated stream")
+    return buf.getvalue()
@@ -1,7 +1,18 @@
+import contextlib
+import importlib
+import io
 import logging
+import os
+import pickle
+import tempfile
 import unittest
+import zlib
+from unittest import mock
 
-from rpycdec import decompile, translate
+from rpycdec import decompile, translate, rpa, stmts, utils
+import renpy.ast
+import renpy.sl2.slast
+import renpy.util
 
 
 class TestRpycDec(unittest.TestCase):
@@ -17,6 +28,218 @@ class TestRpycDec(unittest.TestCase):
         output_file = "tests/script-translated.rpy"
         translate(input_file, output_file)
 
+    def test_translate_workers(self):
+        module = importlib.import_module("rpycdec.translate")
+        with tempfile.TemporaryDirectory() as tmp:
+            files = []
+            for i in range(4):
+                filename = os.path.join(f"sub{i % 2}", f"s{i}.rpyc")
+                os.makedirs(os.path.join(tmp, f"sub{i % 2}"), exist_ok=True)
+                write_rpyc(os.path.join(tmp, filename), [say("e", f"line {i}")])
+                files.append(filename)
+            # a text shared between files gets the same translation in both
+            write_rpyc(os.path.join(tmp, "common.rpyc"), [say(None, "line 0")])
+            files.append("common.rpyc")
+
+            sequential = module._process_files(tmp, files, translator=str.upper)
+            parallel = module._process_files(
+                tmp, files, translator=str.upper, workers=2
+            )
+            self.assertEqual(parallel, sequential)
+            self.assertEqual(sequential["common.rpyc"], '"LINE 0"')
+
+    def test_decompile_incremental(self):
+        module = importlib.import_module("rpycdec.decompile")
+        with tempfile.TemporaryDirectory() as tmp:
+            input_file = os.path.join(tmp, "a.rpyc")
+            output_file = os.path.join(tmp, "a.rpy")
+            cache_file = output_file + ".cache.json"
+            write_rpyc(input_file, [renpy.ast.Pass()])
+
+            # default runs neither skip nor leave a cache file behind
+            decompile(input_file)
+            self.assertFalse(os.path.exists(cache_file))
+
+            decompile(input_file, incremental=True)
+            self.assertTrue(os.path.exists(cache_file))
+            with mock.patch.object(module.utils, "write_file") as write_file:
+                decompile(input_file, incremental=True)
+                write_file.assert_not_called()
+
+            # an output rewritten by something else is regenerated
+            with open(output_file, "w") as f:
+                f.write("translated")
+            decompile(input_file, incremental=True)
+            self.assertEqual(file_content(output_file), "pass")
+
+            # so is every output after rpycdec changed
+            with mock.patch.object(module, "_package_version", return_value="x"):
+                with mock.patch.object(module.utils, "write_file") as write_file:
+                    decompile(input_file, incremental=True)
+                    self.assertTrue(write_file.called)
+
+    def test_decompile_dir_failure(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "c.rpyc"), "wb") as f:
+                f.write(b"broken")
+            # a single file raises its own error
+            with self.assertRaisesRegex(Exception, "^Unsupported file format"):
+                decompile(tmp)
+
+            write_rpyc(os.path.join(tmp, "a.rpyc"), [renpy.ast.Pass()])
+            with open(os.path.join(tmp, "b.rpyc"), "wb") as f:
+                f.write(zlib.compress(pickle.dumps(None)))
+            # every file is tried, then the failures are raised together,
+            # caused by the first one listed
+            with self.assertRaisesRegex(
+                Exception, r"2 of 3 files failed: .*b\.rpyc.*c\.rpyc"
+            ) as cm:
+                decompile(tmp)
+            self.assertIsInstance(cm.exception.__cause__, TypeError)
+            self.assertEqual(file_content(os.path.join(tmp, "a.rpy")), "pass")
+
+    def test_read_rpyc2_slots(self):
+        # slot 1 listed after slot 2
+        data = rpyc2_data({2: b"second", 1: b"first"})
+        self.assertEqual(stmts.read_rpyc_data(io.BytesIO(data), 1), b"first")
+        self.assertEqual(stmts.read_rpyc_data(io.BytesIO(data), 2), b"second")
+        # a slot missing from a terminated table
+        f = io.BytesIO(rpyc2_data({1: b"first"}))
+        self.assertIsNone(stmts.read_rpyc_data(f, 2))
+        # a full table without the zero terminator, its trailing partial
+        # entry ignored
+        header = stmts.RPYC2_HEADER + stmts.RPYC2_SLOT.pack(7, 0, 0) * 84
+        f = io.BytesIO(header + b"\x07" * 6)
+        self.assertIsNone(stmts.read_rpyc_data(f, 1))
+        # a table cut short by the end of the file
+        f = io.BytesIO(stmts.RPYC2_HEADER + stmts.RPYC2_SLOT.pack(7, 0, 0) + b"\x07")
+        self.assertIsNone(stmts.read_rpyc_data(f, 1))
+
+    def test_sink(self):
+        sink = renpy.util.Sink()
+        sink.write("vbox:\n")
+        with sink.indented():
+            sink.write("text 'a'\n\n   \ntext 'b'")
+        self.assertEqual(sink.getvalue(), "vbox:\n    text 'a'\n    text 'b'")
+
+        # blank lines dropped by indentation still count as written
+        sink = renpy.util.Sink()
+        with sink.indented():
+            sink.write("\n\n")
+        self.assertEqual(sink.getvalue(), "")
+        self.assertEqual(sink.written, 2)
+
+        # an if without any code in its body gets a pass
+        node = renpy.sl2.slast.SLIf()
+        node.entries = [("x", []), (None, [renpy.sl2.slast.SLPass()])]
+        self.assertEqual(renpy.util.get_code(node), "if x:\n    pass\nelse:\n    pass")
+
+    def test_decompress_stream(self):
+        data = b"rpyc" * 1000
+        compressed = zlib.compress(data)
+        f = io.BytesIO(compressed + b"trailer")
+        self.assertEqual(utils.decompress_stream(f, len(compressed)), data)
+        self.assertEqual(f.read(), b"trailer")
+
+        with self.assertRaises(zlib.error):
+            utils.decompress_stream(io.BytesIO(compressed[:-8]))
+
+    def test_read_util(self):
+        f = io.BytesIO(b"key\x00value")
+        self.assertEqual(rpa.read_util(f), b"key")
+        self.assertEqual(f.read(), b"value")
+        with self.assertRaises(EOFError):
+            rpa.read_util(io.BytesIO(b"no delimiter"))
+
+    def test_extract_rpa(self):
+        segments = {
+            "a.txt": [(b"hello", None)],
+            # a matching start prefix is stripped, a missing one kept
+            os.path.join("sub", "deep", "b.bin"): [(b"PFXpart1", "PFX"), (b"part2",)],
+            os.path.join("sub", "c.txt"): [(b"data", b"XYZ")],
+        }
+        expected = {
+            "a.txt": b"hello",
+            os.path.join("sub", "deep", "b.bin"): b"part1part2",
+            os.path.join("sub", "c.txt"): b"data",
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, "archive.rpa")
+            write_rpa(archive, segments)
+            # a real file is mapped, a BytesIO is copied through the buffer
+            with open(archive, "rb") as f, contextlib.redirect_stdout(io.StringIO()):
+                rpa.extract_rpa(f)
+            with open(archive, "rb") as f:
+                stream = io.BytesIO(f.read())
+            with mock.patch.object(rpa, "COPY_BUFFER_SIZE", 3):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    rpa.extract_rpa(stream, os.path.join(tmp, "stream"))
+            for dir in ["archive", "stream"]:
+                for name, data in expected.items():
+                    with open(os.path.join(tmp, dir, name), "rb") as f:
+                        self.assertEqual(f.read(), data)
+
+    def test_match_files_suffixes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "sub"))
+            for name in ["a.rpyc", "a.rpy", os.path.join("sub", "b.rpymc")]:
+                open(os.path.join(tmp, name), "w").close()
+            self.assertEqual(
+                sorted(utils.match_files(tmp, utils.RPYC_SUFFIXES)),
+                ["a.rpyc", os.path.join("sub", "b.rpymc")],
+            )
+
+
+def write_rpyc(filename, stmts):
+    with open(filename, "wb") as f:
+        f.write(zlib.compress(pickle.dumps(({}, stmts), protocol=2)))
+
+
+def rpyc2_data(slots):
+    """
+    build an RPYC2 file with slots listed in the order of `slots`
+    """
+    table = b""
+    body = b""
+    for slot, data in slots.items():
+        data = zlib.compress(data)
+        table += stmts.RPYC2_SLOT.pack(slot, 1024 + len(body), len(data))
+        body += data
+    table += stmts.RPYC2_SLOT.pack(0, 0, 0)
+    header = stmts.RPYC2_HEADER + table
+    return header + b"\x00" * (1024 - len(header)) + body
+
+
+def write_rpa(filename, segments, key=0x42424242):
+    """
+    write an RPA-3.0 archive, segments maps names to (data,) or (data, start)
+    """
+    body = io.BytesIO()
+    header_size = 34
+    index = {}
+    for name, parts in segments.items():
+        index[name] = []
+        for data, *start in parts:
+            offset = header_size + body.tell()
+            body.write(data)
+            index[name].append((offset ^ key, len(data) ^ key, *start))
+    index_offset = header_size + body.tell()
+    with open(filename, "wb") as f:
+        f.write(b"RPA-3.0 %016x %08x\n" % (index_offset, key))
+        f.write(body.getvalue())
+        f.write(zlib.compress(pickle.dumps(index, protocol=2)))
+
+
+def say(who, what):
+    node = renpy.ast.Say()
+    node.who, node.what, node.interact = who, what, True
+    return node
+
+
+def file_content(filename):
+    with open(filename, "r") as f:
+        return f.read()
+
 
 def file_compare(file1, file2):
     with open(file1, "r") as f: